@@ -56,15 +56,57 @@ import argparse
 import configparser
 import getpass
 import os
+import shlex
+import socket
 import subprocess
-import time
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
 from glob import glob
-from multiprocessing import Pool
 
 import utility
 
 # region Global Variables
 VERSION = "1.14.0"
+LOCAL_HOSTS = frozenset({"localhost", "127.0.0.1", "::1", socket.gethostname().lower()})
+FULL_FLAGS = ("-ah", "--no-links")
+UPDATE_FLAGS = ("-ahu", "--no-links")
+MIRROR_FLAGS = ("-ah", "--delete")
+VERBOSE_FLAGS = ("-vP", "--stats")
+NO_PERMS_FLAGS = ("--no-perms", "--no-owner", "--no-group")
+DELETE_FLAGS = ("--delete", "--ignore-times")
+SSH_FOLDER = os.path.join(os.path.expanduser("~"), ".ssh")
+ID_RSA = os.path.join(SSH_FOLDER, "id_rsa")
+ID_RSA_PUB = ID_RSA + ".pub"
+SSH_CONTROL_OPTIONS = (
+    "-o ControlMaster=auto -o ControlPersist=60 -o ControlPath="
+    + shlex.quote(os.path.join(SSH_FOLDER, "bb-%C"))
+)
+OS_FOLDERS = {
+    "unix": {
+        "user": "/home",
+        "config": "/etc",
+        "application": "/usr",
+        "system": "/",
+        "log": "/var/log",
+    },
+    "windows": {
+        "user": "/cygdrive/c/Users",
+        "config": "/cygdrive/c/ProgramData",
+        "application": "/cygdrive/c/Program Files",
+        "system": "/cygdrive/c",
+        "log": "/cygdrive/c/Windows/System32/winevt",
+    },
+    "macos": {
+        "user": "/Users",
+        "config": "/private/etc",
+        "application": "/Applications",
+        "system": "/",
+        "log": "/private/var/log",
+    },
+}
+catalog_cache = {}
 
 
 # endregion
@@ -108,97 +150,99 @@ def run_in_parallel(fn, commands, limit):
     :param commands: args commands of function
     :param limit: number of parallel process
     """
-    global args, catalog_path
+    global args, catalog_path, logger
 
-    # Start a Pool with "limit" processes
-    pool = Pool(processes=limit)
-    jobs = []
+    verbose, color = args.verbose, args.color
+    # Start an executor with "limit" workers; every worker waits its own rsync
+    # process, so threads are enough and no python process is forked
+    executor = ThreadPoolExecutor(max_workers=limit)
+    jobs = {}
 
     for command, plog in zip(commands, logs):
         # Run the function
-        proc = pool.apply_async(func=fn, args=(command,))
-        jobs.append(proc)
-        print("info: Start {0} {1}".format(args.action, plog["hostname"]))
-        utility.print_verbose(
-            args.verbose, "rsync command: {0}".format(command), nocolor=args.color
-        )
-        utility.write_log(
+        job = executor.submit(fn, command)
+        jobs[job] = (command, plog)
+        print(f"info: Start {args.action} {plog['hostname']}")
+        if verbose:
+            utility.print_verbose(
+                True,
+                f"rsync command: {shlex.join(command)}",
+                nocolor=color,
+            )
+        logger.log(
             log_args["status"],
             plog["destination"],
             "INFO",
-            "Start process {0} on {1}".format(args.action, plog["hostname"]),
+            f"Start process {args.action} on {plog['hostname']}",
         )
         if args.action == "backup":
-            # Write catalog file
             write_catalog(catalog_path, plog["id"], "start", utility.time_for_log())
+    if args.action == "backup":
+        # Write catalog file
+        flush_catalog(catalog_path)
 
-    # Wait for jobs to complete before exiting
-    while not all([p.ready() for p in jobs]):
-        time.sleep(5)
-
-    # Check exit code of command
-    for p, command, plog in zip(jobs, commands, logs):
-        if p.get() != 0:
+    # Check exit code of command, as soon as each job completes
+    for job in as_completed(jobs):
+        command, plog = jobs[job]
+        exit_code = job.result()
+        if args.action == "backup":
+            # End time is taken once, when the job is completed
+            write_catalog_many(
+                catalog_path,
+                plog["id"],
+                {"end": utility.time_for_log(), "status": str(exit_code)},
+            )
+        if exit_code != 0:
             # Print warning for partial transfer
-            if p.get() in (23, 24):
+            if exit_code in (23, 24):
                 utility.warning(
-                    "Command {0} exit with code (partial transfer): {1}".format(
-                        command, p.get()
-                    ),
-                    nocolor=args.color,
+                    f"Command {shlex.join(command)} exit with code "
+                    f"(partial transfer): {exit_code}",
+                    nocolor=color,
                 )
-                utility.write_log(
+                logger.log(
                     log_args["status"],
                     plog["destination"],
                     "WARNING",
-                    "Finish process {0} on {1} with error (partial transfer):{2}".format(
-                        args.action, plog["hostname"], p.get()
-                    ),
+                    f"Finish process {args.action} on {plog['hostname']} "
+                    f"with error (partial transfer):{exit_code}",
                 )
             else:
                 utility.error(
-                    "Command {0} exit with code: {1}".format(command, p.get()),
-                    nocolor=args.color,
+                    f"Command {shlex.join(command)} exit with code: {exit_code}",
+                    nocolor=color,
                 )
-                utility.write_log(
+                logger.log(
                     log_args["status"],
                     plog["destination"],
                     "ERROR",
-                    "Finish process {0} on {1} with error:{2}".format(
-                        args.action, plog["hostname"], p.get()
-                    ),
+                    f"Finish process {args.action} on {plog['hostname']} "
+                    f"with error:{exit_code}",
                 )
-            if args.action == "backup":
-                # Write catalog file
-                write_catalog(catalog_path, plog["id"], "end", utility.time_for_log())
-                write_catalog(catalog_path, plog["id"], "status", "{0}".format(p.get()))
-                if args.retention and args.skip_err:
-                    # Retention policy
-                    retention_policy(
-                        plog["hostname"], catalog_path, plog["destination"]
-                    )
+            if args.action == "backup" and args.retention and args.skip_err:
+                # Retention policy
+                retention_policy(plog["hostname"], catalog_path, plog["destination"])
 
         else:
-            utility.success("Command {0}".format(command), nocolor=args.color)
-            utility.write_log(
+            utility.success(f"Command {shlex.join(command)}", nocolor=color)
+            logger.log(
                 log_args["status"],
                 plog["destination"],
                 "INFO",
-                "Finish process {0} on {1}".format(args.action, plog["hostname"]),
+                f"Finish process {args.action} on {plog['hostname']}",
             )
-            if args.action == "backup":
-                # Write catalog file
-                write_catalog(catalog_path, plog["id"], "end", utility.time_for_log())
-                write_catalog(catalog_path, plog["id"], "status", "{0}".format(p.get()))
-                if args.retention:
-                    # Retention policy
-                    retention_policy(
-                        plog["hostname"], catalog_path, plog["destination"]
-                    )
+            if args.action == "backup" and args.retention:
+                # Retention policy
+                retention_policy(plog["hostname"], catalog_path, plog["destination"])
 
-    # Safely terminate the pool
-    pool.close()
-    pool.join()
+    if args.action == "backup":
+        # Write catalog file
+        flush_catalog(catalog_path)
+
+    # Safely terminate the executor
+    executor.shutdown()
+    # Write pending logs
+    logger.flush()
 
 
 def start_process(command):
@@ -210,13 +254,13 @@ def start_process(command):
     fd = get_std_out()
     if fd == "DEVNULL":
         p = subprocess.call(
-            command, shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
         )
     elif fd == "STDOUT":
-        p = subprocess.call(command, shell=True)
+        p = subprocess.call(command)
     else:
         p = subprocess.call(
-            command, shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
         )
     return p
 
@@ -256,29 +300,8 @@ def map_dict_folder(os_name):
     :param os_name: Name of operating system
     :return: Dictionary folder structure
     """
-    # Set an empty dictionary folders
-    folders = {}
-    # Check operating system
-    if os_name == "unix":
-        folders["user"] = "/home"
-        folders["config"] = "/etc"
-        folders["application"] = "/usr"
-        folders["system"] = "/"
-        folders["log"] = "/var/log"
-    elif os_name == "windows":
-        folders["user"] = "/cygdrive/c/Users"
-        folders["config"] = "/cygdrive/c/ProgramData"
-        folders["application"] = "'/cygdrive/c/Program Files'"
-        folders["system"] = "/cygdrive/c"
-        folders["log"] = "/cygdrive/c/Windows/System32/winevt"
-    elif os_name == "macos":
-        folders["user"] = "/Users"
-        folders["config"] = "/private/etc"
-        folders["application"] = "/Applications"
-        folders["system"] = "/"
-        folders["log"] = "/private/var/log"
     # Return dictionary with folder structure
-    return folders
+    return OS_FOLDERS.get(os_name, {})
 
 
 def compose_command(flags, host):
@@ -288,7 +311,7 @@ def compose_command(flags, host):
     :param host: Hostname of machine
     :return: list
     """
-    global args, catalog_path, backup_id, rpath, hostname
+    global args, catalog_path, backup_id, rpath, hostname, logger
 
     utility.print_verbose(args.verbose, "Build a rsync command", nocolor=args.color)
     # Set rsync binary
@@ -303,51 +326,43 @@ def compose_command(flags, host):
             command = ["rsync"]
     else:
         command = ["rsync"]
-    catalog = read_catalog(catalog_path)
     if flags.action == "backup":
         # Set mode option
         if flags.mode == "full":
-            command.append("-ah")
-            command.append("--no-links")
+            command.extend(FULL_FLAGS)
             # Write catalog file
             write_catalog(catalog_path, backup_id, "type", "full")
         elif flags.mode == "incremental":
-            last_bck = get_last_backup(catalog)
+            last_bck = get_last_backup(index_catalog(catalog_path))
             if last_bck:
-                command.append("-ahu")
-                command.append("--no-links")
+                command.extend(UPDATE_FLAGS)
                 if not flags.sfrom:
-                    command.append("--link-dest={0}".format(last_bck[0]))
+                    command.append(f"--link-dest={last_bck[0]}")
                 # Write catalog file
                 write_catalog(catalog_path, backup_id, "type", "incremental")
             else:
-                command.append("-ah")
-                command.append("--no-links")
+                command.extend(FULL_FLAGS)
                 # Write catalog file
                 write_catalog(catalog_path, backup_id, "type", "full")
         elif flags.mode == "differential":
-            last_full = get_last_full(catalog)
+            last_full = get_last_full(index_catalog(catalog_path))
             if last_full:
-                command.append("-ahu")
-                command.append("--no-links")
+                command.extend(UPDATE_FLAGS)
                 if not flags.sfrom:
-                    command.append("--link-dest={0}".format(last_full[0]))
+                    command.append(f"--link-dest={last_full[0]}")
                 # Write catalog file
                 write_catalog(catalog_path, backup_id, "type", "differential")
             else:
-                command.append("-ah")
-                command.append("--no-links")
+                command.extend(FULL_FLAGS)
                 # Write catalog file
                 write_catalog(catalog_path, backup_id, "type", "full")
         elif flags.mode == "mirror":
-            command.append("-ah")
-            command.append("--delete")
+            command.extend(MIRROR_FLAGS)
             # Write catalog file
             write_catalog(catalog_path, backup_id, "type", "mirror")
         # Set verbosity
         if flags.verbose:
-            command.append("-vP")
-            command.append("--stats")
+            command.extend(VERBOSE_FLAGS)
         # Set quite mode
         if flags.skip_err:
             command.append("--quiet")
@@ -356,17 +371,17 @@ def compose_command(flags, host):
             command.append("-z")
         # Set bandwidth limit
         if flags.bwlimit:
-            command.append("--bwlimit={0}".format(flags.bwlimit))
+            command.append(f"--bwlimit={flags.bwlimit}")
         # Set ssh custom port
         if flags.port:
-            command.append('--rsh "ssh -p {0}"'.format(flags.port))
+            command.extend(("--rsh", f"ssh -p {flags.port}"))
         # Set I/O timeout
         if flags.timeout:
-            command.append("--timeout={0}".format(flags.timeout))
+            command.append(f"--timeout={flags.timeout}")
         # Set dry-run mode
         if flags.dry_run:
             command.append("--dry-run")
-            utility.write_log(
+            logger.log(
                 log_args["status"],
                 log_args["destination"],
                 "INFO",
@@ -374,23 +389,22 @@ def compose_command(flags, host):
             )
         # Set excludes
         if flags.exclude:
-            for exclude in flags.exclude:
-                command.append("--exclude={0}".format(exclude))
+            command.extend(f"--exclude={exclude}" for exclude in flags.exclude)
         if flags.log:
             log_path = os.path.join(
                 compose_destination(host, flags.destination), "backup.log"
             )
-            command.append("--log-file={0}".format(log_path))
-            utility.write_log(
+            command.append(f"--log-file={log_path}")
+            logger.log(
                 log_args["status"],
                 log_args["destination"],
                 "INFO",
-                "rsync log path: {0}".format(log_path),
+                f"rsync log path: {log_path}",
             )
     elif flags.action == "restore":
         command.append("-ahu")
         if not args.acl:
-            command.append("--no-perms --no-owner --no-group")
+            command.extend(NO_PERMS_FLAGS)
         if flags.verbose:
             command.append("-vP")
             # Set quite mode
@@ -398,21 +412,23 @@ def compose_command(flags, host):
             command.append("--quiet")
         # Set I/O timeout
         if flags.timeout:
-            command.append("--timeout={0}".format(flags.timeout))
+            command.append(f"--timeout={flags.timeout}")
         # Set mirror mode
         if flags.mirror:
-            command.append("--delete")
-            command.append("--ignore-times")
+            command.extend(DELETE_FLAGS)
         # Set bandwidth limit
         if flags.bwlimit:
-            command.append("--bwlimit={0}".format(flags.bwlimit))
-        # Set ssh custom port
-        if flags.port:
-            command.append('--rsh "ssh -p {0}"'.format(flags.port))
+            command.append(f"--bwlimit={flags.bwlimit}")
+        # Set ssh custom port and share one ssh connection between folders
+        if host.lower() not in LOCAL_HOSTS:
+            rsh = f"ssh -p {flags.port} " if flags.port else "ssh "
+            command.extend(("--rsh", rsh + SSH_CONTROL_OPTIONS))
+        elif flags.port:
+            command.extend(("--rsh", f"ssh -p {flags.port}"))
         # Set dry-run mode
         if flags.dry_run:
             command.append("--dry-run")
-            utility.write_log(
+            logger.log(
                 log_args["status"],
                 log_args["destination"],
                 "INFO",
@@ -420,19 +436,19 @@ def compose_command(flags, host):
             )
         # Set excludes
         if flags.exclude:
-            for exclude in flags.exclude:
-                command.append("--exclude={0}".format(exclude))
+            command.extend(f"--exclude={exclude}" for exclude in flags.exclude)
         if flags.log:
             log_path = os.path.join(rpath, "restore.log")
-            command.append("--log-file={0}".format(log_path))
-            utility.write_log(
+            command.append(f"--log-file={log_path}")
+            logger.log(
                 log_args["status"],
                 log_args["destination"],
                 "INFO",
-                "rsync log path: {0}".format(log_path),
+                f"rsync log path: {log_path}",
             )
     elif flags.action == "export":
-        command.append("-ahu --no-perms --no-owner --no-group")
+        command.append("-ahu")
+        command.extend(NO_PERMS_FLAGS)
         if flags.verbose:
             command.append("-vP")
             # Set quite mode
@@ -440,42 +456,36 @@ def compose_command(flags, host):
             command.append("--quiet")
         # Set I/O timeout
         if flags.timeout:
-            command.append("--timeout={0}".format(flags.timeout))
+            command.append(f"--timeout={flags.timeout}")
         # Set mirror mode
         if flags.mirror:
-            command.append("--delete")
-            command.append("--ignore-times")
+            command.extend(DELETE_FLAGS)
         # Set cut mode
         if flags.cut:
             command.append("--remove-source-files")
         # Set includes
         if flags.include:
-            for include in flags.include:
-                command.append("--include={0}".format(include))
-            command.append('--exclude="*"')
+            command.extend(f"--include={include}" for include in flags.include)
+            command.append("--exclude=*")
         # Set excludes
         if flags.exclude:
-            for exclude in flags.exclude:
-                command.append("--exclude={0}".format(exclude))
-        # Set timeout
-        if flags.timeout:
-            command.append("--timeout={0}".format(flags.timeout))
+            command.extend(f"--exclude={exclude}" for exclude in flags.exclude)
         # Set bandwidth limit
         if flags.bwlimit:
-            command.append("--bwlimit={0}".format(flags.bwlimit))
+            command.append(f"--bwlimit={flags.bwlimit}")
         # Set ssh custom port
         if flags.port:
-            command.append('--rsh "ssh -p {0}"'.format(flags.port))
+            command.extend(("--rsh", f"ssh -p {flags.port}"))
         # No copy symbolic link
         if flags.all:
             command.append("--safe-links")
         # Make hard links to specific path
         if flags.link:
-            command.append("--link-dest={0}".format(flags.link))
+            command.append(f"--link-dest={flags.link}")
         # Set dry-run mode
         if flags.dry_run:
             command.append("--dry-run")
-            utility.write_log(
+            logger.log(
                 log_args["status"],
                 log_args["destination"],
                 "INFO",
@@ -483,27 +493,44 @@ def compose_command(flags, host):
             )
         if flags.log:
             log_path = os.path.join(flags.catalog, "export.log")
-            command.append("--log-file={0}".format(log_path))
-            utility.write_log(
+            command.append(f"--log-file={log_path}")
+            logger.log(
                 log_args["status"],
                 log_args["destination"],
                 "INFO",
-                "rsync log path: {0}".format(log_path),
+                f"rsync log path: {log_path}",
             )
-    utility.print_verbose(
-        args.verbose,
-        "Command flags are: {0}".format(" ".join(command)),
-        nocolor=args.color,
-    )
+    if args.verbose:
+        utility.print_verbose(
+            True,
+            f"Command flags are: {shlex.join(command)}",
+            nocolor=args.color,
+        )
     return command
 
 
-def compose_source():
+def read_file_data(file_data):
+    """
+    Read paths of file custom data; blank lines and comments are skipped
+    :param file_data: file object of custom data
+    :return: list
+    """
+    paths = []
+    with file_data:
+        for line in file_data:
+            path = line.strip()
+            if path and not path.startswith("#"):
+                paths.append(path)
+    return paths
+
+
+def compose_source(file_paths=()):
     """
     Compose sources
+    :param file_paths: paths read from file custom data
     :return: list
     """
-    global args, catalog_path, backup_id
+    global args, catalog_path, backup_id, logger
 
     src_list = []
     # Add include to the list
@@ -523,23 +550,23 @@ def compose_source():
     elif args.customdata:
         # This is the custom data
         for custom_data in args.customdata:
-            src_list.append(":'{0}'".format(custom_data.strip()))
+            if custom_data.strip():
+                src_list.append(":{0}".format(custom_data.strip()))
     elif args.filedata:
         # This is the file custom data
-        with args.filedata as file_data:
-            for path in file_data.readlines():
-                src_list.append(":'{0}'".format(path.strip()))
-    utility.write_log(
+        src_list.extend(":{0}".format(path) for path in file_paths)
+    logger.log(
         log_args["status"],
         log_args["destination"],
         "INFO",
         "OS {0}; backup folder {1}".format(args.type, " ".join(src_list)),
     )
-    utility.print_verbose(
-        args.verbose,
-        "Include this criteria: {0}".format(" ".join(src_list)),
-        nocolor=args.color,
-    )
+    if args.verbose:
+        utility.print_verbose(
+            True,
+            "Include this criteria: {0}".format(" ".join(src_list)),
+            nocolor=args.color,
+        )
     return src_list
 
 
@@ -583,9 +610,9 @@ def get_restore_os():
     Get the operating system value on catalog by id
     :return: os value (string)
     """
-    global args, catalog_file
+    global args, catalog_path
 
-    config = read_catalog(os.path.join(args.catalog, catalog_file))
+    config = read_catalog(catalog_path)
     return config.get(args.id, "os")
 
 
@@ -603,152 +630,158 @@ def compose_destination(computer_name, folder):
         second_layer = os.path.join(first_layer, utility.time_for_folder())
     else:
         second_layer = os.path.join(first_layer, "mirror_backup")
-    if not os.path.exists(first_layer):
-        os.mkdir(first_layer)
-        utility.write_log(
-            log_args["status"],
-            log_args["destination"],
-            "INFO",
-            "Create folder {0}".format(first_layer),
-        )
-    if not os.path.exists(second_layer):
+    # Create folders with a mkdir, without checking them before
+    try:
         os.mkdir(second_layer)
-        utility.write_log(
+        new_folders = [second_layer]
+    except FileExistsError:
+        new_folders = []
+    except FileNotFoundError:
+        # Folder of computer is only created here (the logger never creates
+        # folders), so it is new when the backup folder has no parent
+        os.makedirs(second_layer, exist_ok=True)
+        new_folders = [first_layer, second_layer]
+    for new_folder in new_folders:
+        logger.log(
             log_args["status"],
             log_args["destination"],
             "INFO",
-            "Create folder {0}".format(second_layer),
+            "Create folder {0}".format(new_folder),
         )
     # Write catalog file
     write_catalog(catalog_path, backup_id, "path", second_layer)
     return second_layer
 
 
-def get_last_full(catalog):
+def get_last_full(index):
     """
     Get the last full
-    :param catalog: configparser object
+    :param index: catalog index (dict)
     :return: path (string), os (string)
     """
     global hostname, args
 
-    config = catalog
-    if config:
-        dates = []
-        for bid in config.sections():
-            if (
-                config.get(bid, "type") == "full"
-                and config.get(bid, "name") == hostname
-                and (
-                    not config.has_option(bid, "cleaned")
-                    or not config.has_option(bid, "archived")
-                )
-            ):
-                try:
-                    dates.append(utility.string_to_time(config.get(bid, "timestamp")))
-                except configparser.NoOptionError:
-                    utility.error(
-                        "Corrupted catalog! No found timestamp in {0}".format(bid),
-                        nocolor=args.color,
-                    )
-                    exit(2)
-        if dates:
-            last_full = utility.time_to_string(max(dates))
-            if last_full:
-                utility.print_verbose(
-                    args.verbose,
-                    "Last full backup is {0}".format(last_full),
-                    nocolor=args.color,
-                )
-                for bid in config.sections():
-                    if (
-                        config.get(bid, "type") == "full"
-                        and config.get(bid, "name") == hostname
-                        and config.get(bid, "timestamp") == last_full
-                    ):
-                        return config.get(bid, "path"), config.get(bid, "os")
-                return ()
-    else:
-        return ()
+    last_full = last_section(
+        section
+        for section in index.get(hostname, [])
+        if section.get("type") == "full"
+        and ("cleaned" not in section or "archived" not in section)
+    )
+    if last_full:
+        utility.print_verbose(
+            args.verbose,
+            "Last full backup is {0}".format(last_full["timestamp"]),
+            nocolor=args.color,
+        )
+        return last_full["path"], last_full["os"]
+    return ()
 
 
-def get_last_backup(catalog):
+def get_last_backup(index):
     """
     Get the last available backup
-    :param catalog: configparser object
+    :param index: catalog index (dict)
     :return: path (string), os (string)
     """
     global hostname, args
 
-    config = catalog
-    dates = []
-    if config:
-        for bid in config.sections():
-            if config.get(bid, "name") == hostname and (
-                not config.has_option(bid, "cleaned")
-                or not config.has_option(bid, "archived")
-            ):
-                try:
-                    dates.append(utility.string_to_time(config.get(bid, "timestamp")))
-                except configparser.NoOptionError:
-                    utility.error(
-                        "Corrupted catalog! No found timestamp in backup: {0}".format(
-                            bid
-                        ),
-                        nocolor=args.color,
-                    )
-                    exit(2)
-        if dates:
-            dates.sort()
-            last = utility.time_to_string(dates[-1])
-            if last:
-                utility.print_verbose(
-                    args.verbose,
-                    "Last backup is {0}".format(last),
-                    nocolor=args.color,
-                )
-                for bid in config.sections():
-                    if (
-                        config.get(bid, "name") == hostname
-                        and config.get(bid, "timestamp") == last
-                    ):
-                        return config.get(bid, "path"), config.get(bid, "os"), bid
-                return ()
-    else:
-        return ()
+    last = last_section(
+        section
+        for section in index.get(hostname, [])
+        if "cleaned" not in section or "archived" not in section
+    )
+    if last:
+        utility.print_verbose(
+            args.verbose,
+            "Last backup is {0}".format(last["timestamp"]),
+            nocolor=args.color,
+        )
+        return last["path"], last["os"], last.name
+    return ()
 
 
-def count_full(config, name):
+def last_section(backups):
+    """
+    Get the backup with the newest timestamp in a single pass;
+    exit if a backup of catalog has no timestamp
+    :param backups: iterable of catalog sections
+    :return: catalog section or None
+    """
+    global args
+
+    last = None
+    last_timestamp = None
+    for section in backups:
+        timestamp = section.get("timestamp")
+        if timestamp is None:
+            utility.error(
+                "Corrupted catalog! No found timestamp in backup: {0}".format(
+                    section.name
+                ),
+                nocolor=args.color,
+            )
+            exit(2)
+        if last is None or timestamp > last_timestamp:
+            last, last_timestamp = section, timestamp
+    return last
+
+
+def count_full(index, name):
     """
     Count all full (and Incremental) backup in a catalog
-    :param config: configparser object
+    :param index: catalog index (dict)
     :param name: hostname of machine
     :return: count (int)
     """
-    count = 0
-    if config:
-        for bid in config.sections():
-            if (
-                config.get(bid, "type") == "full"
-                or config.get(bid, "type") == "incremental"
-            ) and config.get(bid, "name") == name:
-                count += 1
-    return count
+    return len(
+        [
+            section
+            for section in index.get(name, [])
+            if section["type"] in ("full", "incremental")
+        ]
+    )
 
 
-def list_backup(config, name):
+def list_backup(index, name):
     """
     Count all full in a catalog
-    :param config: configparser object
+    :param index: catalog index (dict)
     :param name: hostname of machine
     :return: r_list (list)
     """
-    r_list = list()
-    if config:
+    return [section.name for section in index.get(name, [])]
+
+
+def index_catalog(catalog):
+    """
+    Index backups of a catalog file by hostname
+    :param catalog: catalog file
+    :return: dict of hostname and list of sections
+    """
+    global catalog_cache
+
+    config = read_catalog(catalog)
+    cached = catalog_cache[os.path.abspath(catalog)]
+    if cached["index"] is None:
+        index = {}
         for bid in config.sections():
-            if config.get(bid, "name") == name:
-                r_list.append(bid)
-    return r_list
+            section = config[bid]
+            index.setdefault(section.get("name"), []).append(section)
+        cached["index"] = index
+    return cached["index"]
+
+
+def catalog_stat(catalog):
+    """
+    Modification time and size of catalog file
+    :param catalog: catalog file
+    :return: tuple or None
+    """
+    try:
+        stat = os.stat(catalog)
+        return stat.st_mtime_ns, stat.st_size
+    except OSError:
+        return None
 
 
 def read_catalog(catalog):
@@ -757,50 +790,108 @@ def read_catalog(catalog):
     :param catalog: catalog file
     :return: catalog file (configparser)
     """
-    global args
-
-    config = configparser.ConfigParser()
+    global args, catalog_cache
+
+    # Return cached catalog if not modified on disk (same mtime and size)
+    catalog = os.path.abspath(catalog)
+    cached = catalog_cache.get(catalog)
+    if cached and (cached["dirty"] or cached["stat"] == catalog_stat(catalog)):
+        return cached["config"]
+    config = configparser.ConfigParser(interpolation=None)
     file = config.read(catalog)
-    if file:
-        return config
-    else:
+    if not file:
         utility.print_verbose(
             args.verbose, "Catalog not found! Create a new one.", nocolor=args.color
         )
         if os.path.exists(os.path.dirname(catalog)):
             utility.touch(catalog)
             config.read(catalog)
-            return config
         else:
             utility.error(
                 "Folder {0} not exist!".format(os.path.dirname(catalog)),
                 nocolor=args.color,
             )
             exit(1)
+    catalog_cache[catalog] = {
+        "config": config,
+        "stat": catalog_stat(catalog),
+        "dirty": False,
+        "index": None,
+    }
+    return config
 
 
 def write_catalog(catalog, section, key, value):
     """
-    Write catalog file
+    Write catalog object; catalog file is written by flush_catalog
     :param catalog: path catalog file
     :param section: section of catalog file
     :param key: key of catalog file
     :param value: value of key of catalog file
     :return:
     """
-    global args
+    write_catalog_many(catalog, section, {key: value})
+
+
+def write_catalog_many(catalog, section, values):
+    """
+    Write many keys of a catalog object; catalog file is written by flush_catalog
+    :param catalog: path catalog file
+    :param section: section of catalog file
+    :param values: dictionary of keys and values of catalog file
+    :return:
+    """
+    global args, catalog_cache
 
     config = read_catalog(catalog)
     if not args.dry_run:
         # Add new section
-        try:
+        if not config.has_section(section):
             config.add_section(section)
+        for key, value in values.items():
             config.set(section, key, value)
-        except configparser.DuplicateSectionError:
-            config.set(section, key, value)
-        # Write new section
-        with open(catalog, "w") as configfile:
-            config.write(configfile)
+        cached = catalog_cache[os.path.abspath(catalog)]
+        cached["dirty"] = True
+        cached["index"] = None
+
+
+def flush_catalog(catalog=None):
+    """
+    Write modified catalog objects into catalog files
+    :param catalog: path catalog file; if None, all modified catalogs
+    """
+    global args, catalog_cache
+
+    if catalog:
+        catalogs = [os.path.abspath(catalog)]
+    else:
+        catalogs = list(catalog_cache)
+    for path in catalogs:
+        cached = catalog_cache.get(path)
+        if cached and cached["dirty"] and not args.dry_run:
+            save_catalog(path)
+
+
+def save_catalog(catalog):
+    """
+    Write cached catalog object into catalog file, atomically
+    :param catalog: path catalog file
+    """
+    global catalog_cache
+
+    catalog = os.path.abspath(catalog)
+    cached = catalog_cache[catalog]
+    # Write a temporary file and replace catalog, so it is never truncated
+    temp_catalog = catalog + ".tmp"
+    with open(temp_catalog, "w") as configfile:
+        cached["config"].write(configfile)
+        # Catalog is on disk before replace, also on network filesystems
+        configfile.flush()
+        os.fsync(configfile.fileno())
+    os.replace(temp_catalog, catalog)
+    cached["stat"] = catalog_stat(catalog)
+    cached["dirty"] = False
+    cached["index"] = None
 
 
 def retention_policy(host, catalog, logpath):
@@ -810,77 +901,81 @@ def retention_policy(host, catalog, logpath):
     :param catalog: catalog file
     :param logpath: path of log file
     """
-    global args
+    global args, logger
 
-    config = read_catalog(catalog)
-    full_count = count_full(config, host)
+    verbose, color = args.verbose, args.color
+    index = index_catalog(catalog)
+    full_count = count_full(index, host)
     if len(args.retention) >= 3:
         utility.error(
             'The "--retention or -r" parameter must have max two integers. '
-            "Three or more arguments specified: {}".format(args.retention),
-            nocolor=args.color,
+            f"Three or more arguments specified: {args.retention}",
+            nocolor=color,
         )
         exit(2)
     if args.retention[1]:
-        backup_list = list_backup(config, host)[-args.retention[1] :]
+        backup_list = set(list_backup(index, host)[-args.retention[1] :])
     else:
-        backup_list = list()
-    cleanup = -1
-    for bid in config.sections():
-        if bid not in backup_list:
-            if (config.get(bid, "cleaned", fallback="unset") == "unset") and (
-                config.get(bid, "name") == host
-            ):
-                type_backup = config.get(bid, "type")
-                path = config.get(bid, "path")
-                date = config.get(bid, "timestamp")
-                if (type_backup == "full" or type_backup == "incremental") and (
-                    full_count <= 1
-                ):
-                    continue
-                utility.print_verbose(
-                    args.verbose,
-                    "Check cleanup this backup {0}. " "Folder {1}".format(bid, path),
-                    nocolor=args.color,
-                )
-                if not dry_run("Cleanup {0} backup folder".format(path)):
-                    cleanup = utility.cleanup(path, date, args.retention[0])
-                if not os.path.exists(path):
-                    utility.print_verbose(
-                        args.verbose,
-                        "This folder {0} does not exist. "
-                        "The backup has already been cleaned.".format(path),
-                        nocolor=args.color,
-                    )
-                    cleanup = 0
-                if cleanup == 0:
-                    write_catalog(catalog, bid, "cleaned", "True")
-                    utility.success(
-                        "Cleanup {0} successfully.".format(path), nocolor=args.color
-                    )
-                    utility.write_log(
-                        log_args["status"],
-                        logpath,
-                        "INFO",
-                        "Cleanup {0} successfully.".format(path),
-                    )
-                    utility.unlink(os.path.join(catalog, host, "last_backup"))
-                elif cleanup == 1:
-                    utility.error(
-                        "Cleanup {0} failed.".format(path), nocolor=args.color
-                    )
-                    utility.write_log(
-                        log_args["status"],
-                        logpath,
-                        "ERROR",
-                        "Cleanup {0} failed.".format(path),
-                    )
-                else:
-                    utility.print_verbose(
-                        args.verbose,
-                        "No cleanup backup {0}. Folder {1}".format(bid, path),
-                        nocolor=args.color,
-                    )
+        backup_list = set()
+    # Check only backups of host
+    candidates = []
+    to_clean = []
+    for section in index.get(host, []):
+        bid = section.name
+        if bid in backup_list or section.get("cleaned", "unset") != "unset":
+            continue
+        path = section.get("path")
+        if section.get("type") in ("full", "incremental") and full_count <= 1:
+            continue
+        if verbose:
+            utility.print_verbose(
+                True,
+                f"Check cleanup this backup {bid}. Folder {path}",
+                nocolor=color,
+            )
+        candidates.append(section)
+        if not dry_run(f"Cleanup {path} backup folder"):
+            to_clean.append(section)
+    # Delete old backup folders concurrently
+    cleanups = cleanup_sections(to_clean, args.retention[0])
+    for section in candidates:
+        bid = section.name
+        path = section.get("path")
+        cleanup = cleanups.get(bid, -1)
+        if not os.path.exists(path):
+            utility.print_verbose(
+                verbose,
+                f"This folder {path} does not exist. "
+                "The backup has already been cleaned.",
+                nocolor=color,
+            )
+            cleanup = 0
+        if cleanup == 0:
+            write_catalog(catalog, bid, "cleaned", "True")
+            utility.success(f"Cleanup {path} successfully.", nocolor=color)
+            logger.log(
+                log_args["status"],
+                logpath,
+                "INFO",
+                f"Cleanup {path} successfully.",
+            )
+            utility.unlink(os.path.join(catalog, host, "last_backup"))
+        elif cleanup == 1:
+            utility.error(f"Cleanup {path} failed.", nocolor=color)
+            logger.log(
+                log_args["status"],
+                logpath,
+                "ERROR",
+                f"Cleanup {path} failed.",
+            )
+        elif verbose:
+            utility.print_verbose(
+                True,
+                f"No cleanup backup {bid}. Folder {path}",
+                nocolor=color,
+            )
+    # Write catalog file
+    flush_catalog(catalog)
 
 
 def archive_policy(catalog, destination):
@@ -889,53 +984,59 @@ def archive_policy(catalog, destination):
     :param catalog: catalog file
     :param destination: destination pth of archive file
     """
-    global args
+    global args, logger
 
+    verbose, color = args.verbose, args.color
     config = read_catalog(catalog)
+    index = index_catalog(catalog)
     archive = -1
+    # Count full backups of every hostname once
+    full_counts = {name: count_full(index, name) for name in index}
     for bid in config.sections():
-        full_count = count_full(config, config.get(bid, "name"))
-        if (config.get(bid, "archived", fallback="unset") == "unset") and not (
-            config.get(bid, "cleaned", fallback=False)
+        section = config[bid]
+        full_count = full_counts.get(section.get("name"), 0)
+        if (section.get("archived", "unset") == "unset") and not (
+            section.get("cleaned", False)
         ):
-            type_backup = config.get(bid, "type")
-            path = config.get(bid, "path")
-            date = config.get(bid, "timestamp")
+            type_backup = section.get("type")
+            path = section.get("path")
+            date = section.get("timestamp")
             logpath = os.path.join(os.path.dirname(path), "general.log")
-            utility.print_verbose(
-                args.verbose,
-                "Check archive this backup {0}. Folder {1}".format(bid, path),
-                nocolor=args.color,
-            )
+            if verbose:
+                utility.print_verbose(
+                    True,
+                    f"Check archive this backup {bid}. Folder {path}",
+                    nocolor=color,
+                )
             if (type_backup == "full") and (full_count <= 1):
                 continue
-            if not dry_run("Archive {0} backup folder".format(path)):
+            if not dry_run(f"Archive {path} backup folder"):
                 archive = utility.archive(path, date, args.days, destination)
             if archive == 0:
                 write_catalog(catalog, bid, "archived", "True")
-                utility.success(
-                    "Archive {0} successfully.".format(path), nocolor=args.color
-                )
-                utility.write_log(
+                utility.success(f"Archive {path} successfully.", nocolor=color)
+                logger.log(
                     log_args["status"],
                     logpath,
                     "INFO",
-                    "Archive {0} successfully.".format(path),
+                    f"Archive {path} successfully.",
                 )
             elif archive == 1:
-                utility.error("Archive {0} failed.".format(path), nocolor=args.color)
-                utility.write_log(
+                utility.error(f"Archive {path} failed.", nocolor=color)
+                logger.log(
                     log_args["status"],
                     logpath,
                     "ERROR",
-                    "Archive {0} failed.".format(path),
+                    f"Archive {path} failed.",
                 )
-            else:
+            elif verbose:
                 utility.print_verbose(
-                    args.verbose,
-                    "No archive backup {0}. Folder {1}".format(bid, path),
-                    nocolor=args.color,
+                    True,
+                    f"No archive backup {bid}. Folder {path}",
+                    nocolor=color,
                 )
+    # Write catalog file
+    flush_catalog(catalog)
 
 
 def deploy_configuration(computer, user):
@@ -947,23 +1048,17 @@ def deploy_configuration(computer, user):
     """
     global args
 
-    # Create home path
-    home = os.path.expanduser("~")
-    ssh_folder = os.path.join(home, ".ssh")
-    # Remove private key file
-    id_rsa_pub_file = os.path.join(ssh_folder, "id_rsa.pub")
     utility.print_verbose(
-        args.verbose, "Public id_rsa is {0}".format(id_rsa_pub_file), nocolor=args.color
+        args.verbose, "Public id_rsa is {0}".format(ID_RSA_PUB), nocolor=args.color
     )
     if not dry_run("Copying configuration to {0}".format(computer)):
-        if os.path.exists(id_rsa_pub_file):
+        if os.path.exists(ID_RSA_PUB):
             print(
                 "info: Copying configuration to {0}".format(computer)
                 + "; write the password:"
             )
             return_code = subprocess.call(
-                "ssh-copy-id -i {0} {1}@{2}".format(id_rsa_pub_file, user, computer),
-                shell=True,
+                ["ssh-copy-id", "-i", ID_RSA_PUB, "{0}@{1}".format(user, computer)]
             )
             utility.print_verbose(
                 args.verbose,
@@ -996,36 +1091,31 @@ def remove_configuration():
     """
     global args
 
-    # Create home path
-    home = os.path.expanduser("~")
-    ssh_folder = os.path.join(home, ".ssh")
     if not dry_run("Remove private id_rsa"):
         if utility.confirm(
             "Are you sure to remove existing rsa keys?", force=args.force
         ):
             # Remove private key file
-            id_rsa_file = os.path.join(ssh_folder, "id_rsa")
             utility.print_verbose(
                 args.verbose,
-                "Remove private id_rsa {0}".format(id_rsa_file),
+                "Remove private id_rsa {0}".format(ID_RSA),
                 nocolor=args.color,
             )
-            if os.path.exists(id_rsa_file):
-                os.remove(id_rsa_file)
+            if os.path.exists(ID_RSA):
+                os.remove(ID_RSA)
             else:
                 utility.warning(
                     "Private key ~/.ssh/id_rsa is not exist", nocolor=args.color
                 )
                 exit(2)
             # Remove public key file
-            id_rsa_pub_file = os.path.join(ssh_folder, "id_rsa.pub")
             utility.print_verbose(
                 args.verbose,
-                "Remove public id_rsa {0}".format(id_rsa_pub_file),
+                "Remove public id_rsa {0}".format(ID_RSA_PUB),
                 nocolor=args.color,
             )
-            if os.path.exists(id_rsa_pub_file):
-                os.remove(id_rsa_pub_file)
+            if os.path.exists(ID_RSA_PUB):
+                os.remove(ID_RSA_PUB)
             else:
                 utility.warning(
                     "Public key ~/.ssh/id_rsa.pub is not exist", nocolor=args.color
@@ -1040,16 +1130,18 @@ def new_configuration():
     """
     global args
 
-    # Create home path
-    home = os.path.expanduser("~")
-    ssh_folder = os.path.join(home, ".ssh")
-    id_rsa_file = os.path.join(ssh_folder, "id_rsa")
     if not dry_run("Generate private/public key pair"):
         # Generate private/public key pair
         utility.print_verbose(
             args.verbose, "Generate private/public key pair", nocolor=args.color
         )
-        return_code = subprocess.call(
+        # ssh-keygen asks before overwriting an existing key pair
+        overwrite = os.path.exists(ID_RSA)
+        if overwrite and not utility.confirm(
+            "Are you sure to overwrite existing rsa keys?", force=args.force
+        ):
+            return
+        return_code = subprocess.run(
             [
                 "ssh-keygen",
                 "-t",
@@ -1057,12 +1149,14 @@ def new_configuration():
                 "-b",
                 "4096",
                 "-N",
-                '""',
+                "",
                 "-f",
-                "{0}".format(id_rsa_file),
+                ID_RSA,
                 "-q",
-            ]
-        )
+            ],
+            input="y\n" if overwrite else None,
+            text=True,
+        ).returncode
         utility.print_verbose(
             args.verbose,
             "Return code of ssh-keygen: {0}".format(return_code),
@@ -1070,29 +1164,57 @@ def new_configuration():
         )
         # Check if something wrong
         if return_code:
-            utility.error(
-                "Creation of {0} error".format(id_rsa_file), nocolor=args.color
-            )
+            utility.error("Creation of {0} error".format(ID_RSA), nocolor=args.color)
             exit(2)
         # Sucess!
         utility.success("New configuration successfully created!", nocolor=args.color)
 
 
-def check_configuration(ip):
+def check_configuration(ip, port=22):
     """
-    Check if configuration is correctly deployed
+    Check if configuration is correctly deployed,
+    reading the ssh banner of remote machine
     :param ip: hostname of pc or ip address
-    :return: output of command
+    :param port: ssh port (default is 22)
+    :return: boolean
     """
-    from subprocess import check_output
-
     try:
-        out = check_output(["ssh-keyscan", "{0}".format(ip)])
-        if not out:
-            return False
-    except subprocess.CalledProcessError:
+        with socket.create_connection((ip, port), timeout=5) as conn:
+            return conn.recv(64).startswith(b"SSH-")
+    except OSError:
         return False
-    return True
+
+
+@lru_cache(maxsize=None)
+def check_ssh(host, user, port):
+    """
+    Test ssh connection once per host in this run
+    :param host: hostname or ip address
+    :param user: user for connection
+    :param port: ssh port
+    :return: boolean
+    """
+    return utility.check_ssh(host, user, port)
+
+
+def check_hosts(hostnames, user, port):
+    """
+    Check ssh connection and configuration of computers concurrently
+    :param hostnames: list of hostname or ip address
+    :param user: user for connection
+    :param port: ssh port
+    :return: dict of hostname and (ssh, configuration) status
+    """
+    global args
+
+    def check_host(host):
+        if not check_ssh(host, user, port):
+            return False, False
+        # Configuration is required only for silently backup
+        return True, args.verbose or check_configuration(host, port)
+
+    with ThreadPoolExecutor(max_workers=args.parallel) as executor:
+        return dict(zip(hostnames, executor.map(check_host, hostnames)))
 
 
 def init_catalog(catalog):
@@ -1115,8 +1237,67 @@ def init_catalog(catalog):
                 )
                 config.remove_section(cid)
         # Write file
-        with open(catalog, "w") as configfile:
-            config.write(configfile)
+        save_catalog(catalog)
+
+
+def cleanup_sections(sections, days):
+    """
+    Delete backup folders of catalog sections concurrently
+    :param sections: list of catalog sections
+    :param days: number of days; only older backups are deleted
+    :return: dict
+    """
+    with ThreadPoolExecutor() as executor:
+        return dict(
+            zip(
+                (section.name for section in sections),
+                executor.map(
+                    lambda section: utility.cleanup(
+                        section.get("path"), section.get("timestamp"), days
+                    ),
+                    sections,
+                ),
+            )
+        )
+
+
+def delete_backups(config, sections):
+    """
+    Delete backup folders concurrently and remove backups from catalog
+    :param config: catalog object (configparser)
+    :param sections: list of catalog sections
+    """
+    global args
+
+    # Backup folders to delete
+    folders = [
+        section
+        for section in sections
+        if section.get("path") and os.path.exists(section.get("path"))
+    ]
+    cleanups = cleanup_sections(folders, 0)
+    for section in sections:
+        # Backup without folder is only removed from catalog
+        if section.name in cleanups:
+            cleanup = cleanups[section.name]
+            if cleanup == 0:
+                utility.success(
+                    "Delete {0} successfully.".format(section.get("path")),
+                    nocolor=args.color,
+                )
+            else:
+                if cleanup == 1:
+                    utility.error(
+                        "Delete {0} failed.".format(section.get("path")),
+                        nocolor=args.color,
+                    )
+                continue
+        utility.print_verbose(
+            args.verbose,
+            "Backup-id {0} has been removed from catalog!".format(section.name),
+            nocolor=args.color,
+        )
+        config.remove_section(section.name)
 
 
 def delete_host(catalog, host):
@@ -1133,41 +1314,19 @@ def delete_host(catalog, host):
     if utility.confirm(
         "Delete all backups for host {0}?".format(host), force=args.force
     ):
-        for cid in config.sections():
-            if config.get(cid, "name") == host:
-                if not config.get(cid, "path") or not os.path.exists(
-                    config.get(cid, "path")
-                ):
-                    utility.print_verbose(
-                        args.verbose,
-                        "Backup-id {0} has been removed from catalog!".format(cid),
-                        nocolor=args.color,
-                    )
-                    config.remove_section(cid)
-                else:
-                    path = config.get(cid, "path")
-                    date = config.get(cid, "timestamp")
-                    cleanup = utility.cleanup(path, date, 0)
-                    if cleanup == 0:
-                        utility.success(
-                            "Delete {0} successfully.".format(path), nocolor=args.color
-                        )
-                        utility.print_verbose(
-                            args.verbose,
-                            "Backup-id {0} has been removed from catalog!".format(cid),
-                            nocolor=args.color,
-                        )
-                        config.remove_section(cid)
-                    elif cleanup == 1:
-                        utility.error(
-                            "Delete {0} failed.".format(path), nocolor=args.color
-                        )
+        delete_backups(
+            config,
+            [
+                config[cid]
+                for cid in config.sections()
+                if config.get(cid, "name", fallback=None) == host
+            ],
+        )
         # Remove root folder
         if os.path.exists(root):
             rmtree(root)
         # Write file
-        with open(catalog, "w") as configfile:
-            config.write(configfile)
+        save_catalog(catalog)
 
 
 def delete_backup(catalog, bckid):
@@ -1184,32 +1343,9 @@ def delete_backup(catalog, bckid):
         "Delete backup {0} from catalog {1}?".format(bckid, catalog), force=args.force
     ):
         if bck_id:
-            if not bck_id.get("path") or not os.path.exists(bck_id.get("path")):
-                utility.print_verbose(
-                    args.verbose,
-                    "Backup-id {0} has been removed from catalog!".format(bckid),
-                    nocolor=args.color,
-                )
-                config.remove_section(bck_id.name)
-            else:
-                path = bck_id.get("path")
-                date = bck_id.get("timestamp")
-                cleanup = utility.cleanup(path, date, 0)
-                if cleanup == 0:
-                    utility.success(
-                        "Delete {0} successfully.".format(path), nocolor=args.color
-                    )
-                    utility.print_verbose(
-                        args.verbose,
-                        "Backup-id {0} has been removed from catalog!".format(bckid),
-                        nocolor=args.color,
-                    )
-                    config.remove_section(bck_id.name)
-                elif cleanup == 1:
-                    utility.error("Delete {0} failed.".format(path), nocolor=args.color)
+            delete_backups(config, [bck_id])
         # Write file
-        with open(catalog, "w") as configfile:
-            config.write(configfile)
+        save_catalog(catalog)
 
 
 def clean_catalog(catalog):
@@ -1224,35 +1360,36 @@ def clean_catalog(catalog):
         "Start check catalog file: {0}!".format(catalog),
         nocolor=args.color,
     )
+    # Default values of corrupted backup-id
+    now = utility.time_for_log()
+    defaults = (
+        ("type", "incremental"),
+        ("name", "default"),
+        ("os", "unix"),
+        ("timestamp", now),
+        ("start", now),
+        ("end", now),
+        ("status", "0"),
+    )
     for cid in config.sections():
-        utility.print_verbose(
-            args.verbose, "Check backup-id: {0}!".format(cid), nocolor=args.color
-        )
-        mod = False
-        if not config.get(cid, "type", fallback=""):
-            config.set(cid, "type", "incremental")
-            mod = True
-        if not config.get(cid, "path", fallback=""):
+        if args.verbose:
+            utility.print_verbose(
+                True, "Check backup-id: {0}!".format(cid), nocolor=args.color
+            )
+        section = config[cid]
+        if not section.get("path"):
             config.remove_section(cid)
-            mod = True
-        if not config.get(cid, "name", fallback=""):
-            config.set(cid, "name", "default")
-            mod = True
-        if not config.get(cid, "os", fallback=""):
-            config.set(cid, "os", "unix")
-            mod = True
-        if not config.get(cid, "timestamp", fallback=""):
-            config.set(cid, "timestamp", utility.time_for_log())
-            mod = True
-        if not config.get(cid, "start", fallback=""):
-            config.set(cid, "start", utility.time_for_log())
-            mod = True
-        if not config.get(cid, "end", fallback=""):
-            config.set(cid, "end", utility.time_for_log())
-            mod = True
-        if not config.get(cid, "status", fallback=""):
-            config.set(cid, "status", "0")
-            mod = True
+            utility.warning(
+                "The backup-id {0} has been removed from catalog, "
+                "because he has no path.".format(cid),
+                nocolor=args.color,
+            )
+            continue
+        mod = False
+        for key, value in defaults:
+            if not section.get(key):
+                section[key] = value
+                mod = True
         if mod:
             utility.warning(
                 "The backup-id {0} has been set to default value, "
@@ -1261,24 +1398,82 @@ def clean_catalog(catalog):
                 nocolor=args.color,
             )
     # Write file
-    with open(catalog, "w") as configfile:
-        config.write(configfile)
+    save_catalog(catalog)
 
 
 def get_files(bckid, files):
-    """Get list of files"""
+    """Get files, as a generator of paths"""
     # Get path from id
     path = bckid.get("path")
     if path:
-        # Search files into backup folder
-        return [f for file in files for f in glob("{0}/**/*{1}*".format(path, file))]
-    else:
-        return []
+        # Search files into backup folder, walking it once
+        for root, dirs, names in os.walk(path):
+            matched = [name for name in dirs if any(file in name for file in files)]
+            for name in matched:
+                yield os.path.join(root, name)
+                # Folder is restored with its content: skip walking it
+                dirs.remove(name)
+            for name in names:
+                if any(file in name for file in files):
+                    yield os.path.join(root, name)
+
+
+def catalog_lines(catalog, sections, title):
+    """
+    Generate the lines of a catalog listing, writing them into log
+    :param catalog: configparser object
+    :param sections: backup-id to list
+    :param title: title of listing
+    :return: generator of lines (string)
+    """
+    global log_args, logger
+
+    status, destination = log_args["status"], log_args["destination"]
+    logger.log(status, destination, "INFO", title)
+    yield "{0}\n\n".format(title)
+    for lid in sections:
+        # Get session backup id, reading its fields once
+        bck_id = catalog[lid]
+        name = bck_id.get("name", "")
+        timestamp = bck_id.get("timestamp", "")
+        if status:
+            logger.log_many(
+                status,
+                destination,
+                "INFO",
+                (
+                    "Backup id: {0}".format(lid),
+                    "Hostname or ip: {0}".format(name),
+                    "Timestamp: {0}".format(timestamp),
+                ),
+            )
+        yield "Backup id: {0}\nHostname or ip: {1}\nTimestamp: {2}\n\n".format(
+            lid, name, timestamp
+        )
 
 
+def positive_int(value):
+    """
+    Argument type of an integer greater than zero
+    :param value: value of argument
+    :return: int
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError(
+            "{0} is not an integer greater than zero".format(value)
+        )
+    return number
+
+
+@lru_cache(maxsize=1)
 def parse_arguments():
     """
-    Function get arguments than specified in command line
+    Function get arguments than specified in command line;
+    parser is built once and reused
     :return: parser
     """
     global VERSION
@@ -1609,6 +1804,15 @@ def parse_arguments():
         choices=["unix", "windows", "macos"],
         type=str.lower,
     )
+    group_restore.add_argument(
+        "--parallel",
+        "-p",
+        help="Number of parallel jobs",
+        dest="parallel",
+        action="store",
+        type=positive_int,
+        default=1,
+    )
     group_restore.add_argument(
         "--timeout",
         "-T",
@@ -1839,11 +2043,17 @@ def main():
     """Main process"""
 
     global args, catalog_path, backup_id, rpath, log_args, logs, hostname, catalog_file
+    global logger
 
     # Create arguments object
     parser = parse_arguments()
     args = parser.parse_args()
     catalog_file = ".catalog.cfg"
+    # Remove color if standard output isn't a terminal
+    if not sys.stdout.isatty():
+        args.color = True
+    # Write logs in background
+    logger = utility.AsyncLogger()
 
     try:
         # Check config session
@@ -1874,10 +2084,9 @@ def main():
         # Check backup session
         if args.action == "backup":
             # Check rsync tool
-            rsync_path = args.rsync if args.rsync else None
-            check_rsync(rsync_path)
+            check_rsync(args.rsync)
             # Check custom ssh port
-            port = args.port if args.port else 22
+            port = args.port or 22
             hostnames = []
             cmds = []
             logs = []
@@ -1886,10 +2095,10 @@ def main():
                 hostnames.append(args.hostname)
             elif args.list:
                 if os.path.exists(args.list) and os.path.isfile(args.list):
-                    list_file = open(args.list, "r").read().split()
-                    for line in list_file:
+                    with open(args.list, "r") as list_file:
                         # Computer list
-                        hostnames.append(line)
+                        for line in list_file:
+                            hostnames.extend(line.split())
                 else:
                     utility.error(
                         "The file {0} not exist or is a directory!".format(args.list),
@@ -1899,109 +2108,127 @@ def main():
             else:
                 parser.print_usage()
                 exit(1)
-            for hostname in hostnames:
-                if not utility.check_ssh(hostname, args.user, port):
-                    utility.error(
-                        "SSH connection failed on {1}:{0}".format(port, hostname),
-                        nocolor=args.color,
-                    )
-                    continue
-                if not args.verbose:
-                    if not check_configuration(hostname):
+            # Paths of file custom data are read once, for all computers
+            file_paths = read_file_data(args.filedata) if args.filedata else []
+            # Check connection of all computers concurrently
+            host_status = check_hosts(hostnames, args.user, port)
+            # Read catalog file once; every host updates the same catalog object
+            catalog_path = os.path.join(args.destination, catalog_file)
+            backup_catalog = read_catalog(catalog_path)
+            # Timestamp of backups of this run
+            timestamp = utility.time_for_log()
+            try:
+                for hostname in hostnames:
+                    ssh_status, config_status = host_status[hostname]
+                    if not ssh_status:
+                        utility.error(
+                            "SSH connection failed on {1}:{0}".format(port, hostname),
+                            nocolor=args.color,
+                        )
+                        continue
+                    if not config_status:
                         utility.error(
                             "For bulk or silently backup, deploy configuration! "
                             "See bb config --help or specify --verbose",
                             nocolor=args.color,
                         )
                         continue
-                # Log information's
-                backup_id = "{}".format(utility.new_id())
-                log_args = {
-                    "id": backup_id,
-                    "hostname": hostname,
-                    "status": args.log,
-                    "destination": os.path.join(
-                        args.destination, hostname, "general.log"
-                    ),
-                }
-                logs.append(log_args)
-                catalog_path = os.path.join(args.destination, catalog_file)
-                backup_catalog = read_catalog(catalog_path)
-                # Compose command
-                cmd = compose_command(args, hostname)
-                # Check if start-from is specified
-                if args.sfrom:
-                    if backup_catalog.has_section(args.sfrom):
-                        # Check if exist path of backup
-                        path = backup_catalog.get(args.sfrom, "path")
-                        if os.path.exists(path):
-                            cmd.append("--copy-dest={0}".format(path))
+                    # Log information's
+                    backup_id = "{}".format(utility.new_id())
+                    host_root = os.path.join(args.destination, hostname)
+                    log_args = {
+                        "id": backup_id,
+                        "hostname": hostname,
+                        "status": args.log,
+                        "destination": os.path.join(host_root, "general.log"),
+                    }
+                    # Compose source, before writing anything into catalog
+                    source_list = compose_source(file_paths)
+                    if not source_list:
+                        utility.error(
+                            "No path to backup: check --custom-data or --file-data",
+                            nocolor=args.color,
+                        )
+                        exit(1)
+                    logs.append(log_args)
+                    # Compose command
+                    cmd = compose_command(args, hostname)
+                    # Check if start-from is specified
+                    if args.sfrom:
+                        if backup_catalog.has_section(args.sfrom):
+                            # Check if exist path of backup
+                            path = backup_catalog.get(args.sfrom, "path")
+                            if os.path.exists(path):
+                                cmd.append("--copy-dest={0}".format(path))
+                            else:
+                                utility.warning(
+                                    "Backup folder {0} not exist!".format(path),
+                                    nocolor=args.color,
+                                )
                         else:
-                            utility.warning(
-                                "Backup folder {0} not exist!".format(path),
+                            utility.error(
+                                "Backup id {0} not exist in catalog {1}!".format(
+                                    args.sfrom, args.destination
+                                ),
                                 nocolor=args.color,
                             )
+                            exit(1)
+                    utility.print_verbose(
+                        args.verbose,
+                        "Create a folder structure for {0} os".format(args.type),
+                        nocolor=args.color,
+                    )
+                    # Write catalog file
+                    write_catalog_many(
+                        catalog_path, backup_id, {"name": hostname, "os": args.type}
+                    )
+                    # Check if hostname is localhost or 127.0.0.1
+                    if hostname.lower() in LOCAL_HOSTS:
+                        # Compose source with only path of every folder
+                        cmd.extend(source[1:] for source in source_list)
                     else:
-                        utility.error(
-                            "Backup id {0} not exist in catalog {1}!".format(
-                                args.sfrom, args.destination
-                            ),
-                            nocolor=args.color,
+                        # Compose source <user>@<hostname> format; next folders
+                        # keep ":" prefix to use the same remote host
+                        cmd.append(
+                            "{0}@{1}{2}".format(args.user, hostname, source_list[0])
                         )
-                        exit(1)
-                utility.print_verbose(
-                    args.verbose,
-                    "Create a folder structure for {0} os".format(args.type),
-                    nocolor=args.color,
-                )
-                # Write catalog file
-                write_catalog(catalog_path, backup_id, "name", hostname)
-                write_catalog(catalog_path, backup_id, "os", args.type)
-                # Compose source
-                source_list = compose_source()
-                # Check if hostname is localhost or 127.0.0.1
-                if (hostname.lower() == "localhost") or (hostname == "127.0.0.1"):
-                    # Compose source with only path of folder list
-                    cmd.append(" ".join(source_list)[1:])
-                else:
-                    # Compose source <user>@<hostname> format
-                    cmd.append(
-                        "{0}@{1}".format(args.user, hostname) + (" ".join(source_list))
+                        cmd.extend(source_list[1:])
+                    # Compose destination
+                    bck_dst = compose_destination(hostname, args.destination)
+                    utility.print_verbose(
+                        args.verbose,
+                        "Destination is {0}".format(bck_dst),
+                        nocolor=args.color,
                     )
-                # Compose destination
-                bck_dst = compose_destination(hostname, args.destination)
-                utility.print_verbose(
-                    args.verbose,
-                    "Destination is {0}".format(bck_dst),
-                    nocolor=args.color,
-                )
-                utility.write_log(
-                    log_args["status"],
-                    log_args["destination"],
-                    "INFO",
-                    "Backup on folder {0}".format(bck_dst),
-                )
-                cmd.append(bck_dst)
-                # Compose pull commands
-                cmds.append(" ".join(cmd))
-                # Write catalog file
-                write_catalog(
-                    catalog_path, backup_id, "timestamp", utility.time_for_log()
-                )
-                # Create a symlink for last backup
-                utility.make_symlink(
-                    bck_dst, os.path.join(args.destination, hostname, "last_backup")
-                )
+                    logger.log(
+                        log_args["status"],
+                        log_args["destination"],
+                        "INFO",
+                        "Backup on folder {0}".format(bck_dst),
+                    )
+                    cmd.append(bck_dst)
+                    # Compose pull commands
+                    cmds.append(cmd)
+                    # Write catalog file
+                    write_catalog(catalog_path, backup_id, "timestamp", timestamp)
+                    # Create a symlink for last backup
+                    utility.make_symlink(
+                        bck_dst, os.path.join(host_root, "last_backup")
+                    )
+            except BaseException:
+                # Backups never started: remove their backup-id from catalog
+                for plog in logs:
+                    backup_catalog.remove_section(plog["id"])
+                raise
             # Start backup
             run_in_parallel(start_process, cmds, args.parallel)
 
         # Check restore session
         if args.action == "restore":
             # Check rsync tool
-            rsync_path = args.rsync if args.rsync else None
-            check_rsync(rsync_path)
+            check_rsync(args.rsync)
             # Check custom ssh port
-            port = args.port if args.port else 22
+            port = args.port or 22
             cmds = []
             logs = []
             rhost = ""
@@ -2010,15 +2237,15 @@ def main():
             bos = ""
             ros = ""
             rfolders = []
+            catalog_path = os.path.join(args.catalog, catalog_file)
             if not args.type and args.id:
                 args.type = get_restore_os()
             # Read catalog file
-            catalog_path = os.path.join(args.catalog, catalog_file)
             restore_catalog = read_catalog(catalog_path)
             # Check if select backup-id or last backup
             if args.last:
                 rhost = hostname
-                last_backup = get_last_backup(restore_catalog)
+                last_backup = get_last_backup(index_catalog(catalog_path))
                 if not args.type:
                     args.type = last_backup[1]
                 rpath = last_backup[0]
@@ -2031,7 +2258,7 @@ def main():
                             args.files,
                         )
                     else:
-                        rfolders = [f.path for f in os.scandir(rpath) if f.is_dir()]
+                        rfolders = utility.list_folders(rpath)
                 else:
                     utility.error(
                         "Backup folder {0} not exist!".format(rpath), nocolor=args.color
@@ -2050,7 +2277,7 @@ def main():
                         if args.files:
                             rfolders = get_files(bck_id, args.files)
                         else:
-                            rfolders = [f.path for f in os.scandir(rpath) if f.is_dir()]
+                            rfolders = utility.list_folders(rpath)
                     else:
                         utility.error(
                             "Backup folder {0} not exist!".format(bck_id.get("path")),
@@ -2066,14 +2293,14 @@ def main():
                     )
                     exit(1)
             # Test connection
-            if not utility.check_ssh(rhost, args.user, port):
+            if not check_ssh(rhost, args.user, port):
                 utility.error(
                     "SSH connection failed on {1}:{0}".format(port, rhost),
                     nocolor=args.color,
                 )
                 exit(1)
             if not args.verbose:
-                if not check_configuration(rhost):
+                if not check_configuration(rhost, port):
                     utility.error(
                         "For bulk or silently backup to deploy configuration!"
                         "See bb config --help or specify --verbose",
@@ -2085,53 +2312,90 @@ def main():
                 "status": args.log,
                 "destination": os.path.join(os.path.dirname(rpath), "general.log"),
             }
-            utility.write_log(
+            logger.log(
                 log_args["status"],
                 log_args["destination"],
                 "INFO",
                 "Restore on {0}".format(rhost),
             )
-            # Check if backup has folder to restore
-            if rfolders:
-                for rf in rfolders:
-                    # Append logs
-                    logs.append(log_args)
-                    # Compose command
-                    cmd = compose_command(args, rhost)
-                    # Compose source and destination
-                    if args.files:
-                        src_dst = compose_restore_src_dst(bos, ros, rf)
+            # Check if hostname is localhost or 127.0.0.1
+            is_local = hostname.lower() in LOCAL_HOSTS
+            # Destination prefix <user>@<hostname>: of remote restore
+            remote = "{0}@{1}:".format(args.user, rhost)
+            files, force = args.files, args.force
+            # Options of rsync are the same for every folder
+            base_cmd = compose_command(args, rhost)
+            # Folders are consumed as they are found
+            found = False
+            # Files selected by --files, restored by a single rsync
+            selected, files_dst, files_from = [], None, None
+            for rf in rfolders:
+                found = True
+                # Append logs
+                logs.append(log_args)
+                # Compose source and destination
+                if files:
+                    src_dst = compose_restore_src_dst(bos, ros, rf)
+                else:
+                    src_dst = compose_restore_src_dst(bos, ros, os.path.basename(rf))
+                if src_dst:
+                    src = src_dst[0]
+                    rsrc = os.path.join(rpath, src)
+                    dst = src_dst[1]
+                    if is_local:
+                        # Compose destination only with path of folder
+                        rdst = dst
                     else:
-                        src_dst = compose_restore_src_dst(
-                            bos, ros, os.path.basename(rf)
-                        )
-                    if src_dst:
-                        src = src_dst[0]
-                        # Compose source
-                        cmd.append(os.path.join(rpath, src))
-                        dst = src_dst[1]
-                        if (hostname.lower() == "localhost") or (
-                            hostname == "127.0.0.1"
-                        ):
-                            # Compose destination only with path of folder
-                            cmd.append("{}".format(dst))
+                        # Compose destination <user>@<hostname> format
+                        rdst = remote + dst
+                    # Add command
+                    if utility.confirm(
+                        "Want to do restore path {0} into {1} at {2}?".format(
+                            rsrc, rhost, dst
+                        ),
+                        force=force,
+                    ):
+                        if files:
+                            selected.append(os.path.relpath(rf, rpath))
+                            files_dst = files_dst or rdst
                         else:
-                            # Compose destination <user>@<hostname> format
-                            cmd.append("{0}@{1}:".format(args.user, rhost).__add__(dst))
-                        # Add command
-                        if utility.confirm(
-                            "Want to do restore path {0} into {1} at {2}?".format(
-                                os.path.join(rpath, src), rhost, dst
-                            ),
-                            force=args.force,
-                        ):
-                            cmds.append(" ".join(cmd))
-                # Start restore
-                run_in_parallel(start_process, cmds, 1)
+                            # Compose command
+                            cmd = base_cmd.copy()
+                            # Compose source, expanding wildcard like a shell
+                            cmd.extend(sorted(glob(rsrc)) or [rsrc])
+                            cmd.append(rdst)
+                            cmds.append(cmd)
+            if selected:
+                # List of files, relative to backup folder and separated by NUL
+                with tempfile.NamedTemporaryFile(
+                    "w", prefix="bb-", suffix=".list", delete=False
+                ) as files_from:
+                    files_from.write("\0".join(selected))
+                cmd = base_cmd.copy()
+                cmd.extend(
+                    (
+                        "-r",
+                        "--no-relative",
+                        "--from0",
+                        "--files-from={0}".format(files_from.name),
+                        os.path.join(rpath, ""),
+                        files_dst,
+                    )
+                )
+                cmds.append(cmd)
+            # Check if backup has folder to restore
+            if found:
+                # Start restore, every folder has its own destination
+                logger.flush()
+                try:
+                    run_in_parallel(start_process, cmds, args.parallel)
+                finally:
+                    if files_from:
+                        os.remove(files_from.name)
             else:
                 utility.warning(
                     "Restore files or folders aren't available on backup id {0}".format(
-                        args.id if hasattr(args, "id") else args.last
+                        args.id or "last"
                     ),
                     nocolor=args.color,
                 )
@@ -2144,9 +2408,9 @@ def main():
                 "destination": os.path.join(args.catalog, "archive.log"),
             }
             # Read catalog file
-            archive_catalog = os.path.join(args.catalog, catalog_file)
+            catalog_path = os.path.join(args.catalog, catalog_file)
             # Archive paths
-            archive_policy(archive_catalog, args.destination)
+            archive_policy(catalog_path, args.destination)
 
         # Check list session
         if args.action == "list":
@@ -2156,7 +2420,8 @@ def main():
                 "destination": os.path.join(args.catalog, "backup.list"),
             }
             # Read catalog file
-            list_catalog = read_catalog(os.path.join(args.catalog, catalog_file))
+            catalog_path = os.path.join(args.catalog, catalog_file)
+            list_catalog = read_catalog(catalog_path)
             # Check specified argument backup-id
             if args.id:
                 # Get session backup id
@@ -2216,14 +2481,14 @@ def main():
                         nocolor=args.color,
                         endline=endline,
                     )
-                    if list_catalog.get(args.id, "cleaned", fallback=False):
+                    if bck_id.get("cleaned"):
                         utility.print_values(
                             "Cleaned",
                             bck_id.get("cleaned", "False"),
                             nocolor=args.color,
                             endline=endline,
                         )
-                    elif list_catalog.get(args.id, "archived", fallback=False):
+                    elif bck_id.get("archived"):
                         utility.print_values(
                             "Archived",
                             bck_id.get("archived", "False"),
@@ -2233,7 +2498,7 @@ def main():
                     else:
                         newline = " " if args.oneline else "\n"
                         if bck_id.get("path"):
-                            dirs = os.listdir(bck_id.get("path"))
+                            dirs = utility.list_dir(bck_id.get("path"))
                         else:
                             dirs = []
                         utility.print_values(
@@ -2253,12 +2518,13 @@ def main():
                 list_sections = list_catalog.sections()
                 list_sections.reverse()
                 for lid in list_sections:
+                    # Get session backup id
+                    section = list_catalog[lid]
                     # Filter for hostname
                     if args.hostname:
-                        if args.hostname != list_catalog[lid].get("name", ""):
+                        if args.hostname != section.get("name", ""):
                             continue
-                    # Get session backup id
-                    bck_id = list_catalog[lid]
+                    bck_id = section
                     break
                 if bck_id:
                     endline = " - " if args.oneline else "\n"
@@ -2315,14 +2581,14 @@ def main():
                         nocolor=args.color,
                         endline=endline,
                     )
-                    if list_catalog.get(args.id, "cleaned", fallback=False):
+                    if bck_id.get("cleaned"):
                         utility.print_values(
                             "Cleaned",
                             bck_id.get("cleaned", "False"),
                             nocolor=args.color,
                             endline=endline,
                         )
-                    elif list_catalog.get(args.id, "archived", fallback=False):
+                    elif bck_id.get("archived"):
                         utility.print_values(
                             "Archived",
                             bck_id.get("archived", "False"),
@@ -2332,7 +2598,7 @@ def main():
                     else:
                         newline = " " if args.oneline else "\n"
                         if bck_id.get("path"):
-                            dirs = os.listdir(bck_id.get("path"))
+                            dirs = utility.list_dir(bck_id.get("path"))
                         else:
                             dirs = []
                         utility.print_values(
@@ -2350,6 +2616,7 @@ def main():
                 # Get session backup id
                 bck_id = utility.get_bckid(list_catalog, args.detail)
                 if bck_id:
+                    path = bck_id.get("path", "")
                     log_args["hostname"] = bck_id.get("name")
                     logs = [log_args]
                     utility.print_verbose(
@@ -2359,36 +2626,35 @@ def main():
                     )
                     utility.print_values(
                         "Detail of backup folder",
-                        bck_id.get("path", ""),
+                        path,
                         nocolor=args.color,
                     )
-                    if bck_id.get("path") and os.path.exists(bck_id.get("path")):
-                        utility.print_values(
-                            "List",
-                            "\n".join(os.listdir(bck_id.get("path", "-"))),
-                            nocolor=args.color,
-                        )
+                    if path and os.path.exists(path):
+                        # Recursive listing of rsync includes the top level folders
                         if log_args["status"]:
-                            utility.write_log(
+                            logger.log(
                                 log_args["status"],
                                 log_args["destination"],
                                 "INFO",
                                 "BUTTERFLY BACKUP DETAIL "
-                                "(BACKUP-ID: {0} PATH: {1})".format(
-                                    bck_id.name, bck_id.get("path", "")
-                                ),
-                            )
-                            cmd = "rsync --list-only -r --log-file={0} {1}".format(
-                                log_args["destination"], bck_id.get("path")
+                                "(BACKUP-ID: {0} PATH: {1})".format(bck_id.name, path),
                             )
+                            cmd = [
+                                "rsync",
+                                "--list-only",
+                                "-r",
+                                "--log-file={0}".format(log_args["destination"]),
+                                path,
+                            ]
                         else:
-                            cmd = "rsync --list-only -r {0}".format(bck_id.get("path"))
+                            cmd = ["rsync", "--list-only", "-r", path]
                     else:
                         utility.error(
-                            "No such file or directory: {}".format(bck_id.get("path")),
+                            "No such file or directory: {}".format(path),
                             nocolor=args.color,
                         )
                         exit(1)
+                    logger.flush()
                     start_process(cmd)
                 else:
                     utility.error(
@@ -2396,165 +2662,47 @@ def main():
                         nocolor=args.color,
                     )
                     exit(1)
-            elif args.archived:
-                utility.print_verbose(
-                    args.verbose,
-                    "List all archived backup in catalog",
-                    nocolor=args.color,
-                )
-                text = "BUTTERFLY BACKUP CATALOG (ARCHIVED)\n\n"
-                utility.write_log(
-                    log_args["status"],
-                    log_args["destination"],
-                    "INFO",
-                    "BUTTERFLY BACKUP CATALOG (ARCHIVED)",
-                )
-                for lid in list_catalog.sections():
-                    # Get session backup id
-                    bck_id = list_catalog[lid]
-                    if "archived" in bck_id:
-                        utility.write_log(
-                            log_args["status"],
-                            log_args["destination"],
-                            "INFO",
-                            "Backup id: {0}".format(lid),
-                        )
-                        utility.write_log(
-                            log_args["status"],
-                            log_args["destination"],
-                            "INFO",
-                            "Hostname or ip: {0}".format(bck_id.get("name", "")),
-                        )
-                        utility.write_log(
-                            log_args["status"],
-                            log_args["destination"],
-                            "INFO",
-                            "Timestamp: {0}".format(bck_id.get("timestamp", "")),
-                        )
-                        text += "Backup id: {0}".format(lid)
-                        text += "\n"
-                        text += "Hostname or ip: {0}".format(bck_id.get("name", ""))
-                        text += "\n"
-                        text += "Timestamp: {0}".format(bck_id.get("timestamp", ""))
-                        text += "\n\n"
-                utility.pager(text)
-            elif args.cleaned:
+            elif args.archived or args.cleaned:
+                # Same listing, filtered by archived or cleaned field
+                field = "archived" if args.archived else "cleaned"
                 utility.print_verbose(
                     args.verbose,
-                    "List all cleaned backup in catalog",
+                    "List all {0} backup in catalog".format(field),
                     nocolor=args.color,
                 )
-                text = "BUTTERFLY BACKUP CATALOG (CLEANED)\n\n"
-                utility.write_log(
-                    log_args["status"],
-                    log_args["destination"],
-                    "INFO",
-                    "BUTTERFLY BACKUP CATALOG (CLEANED)",
+                utility.pager_iter(
+                    catalog_lines(
+                        list_catalog,
+                        (
+                            lid
+                            for lid in list_catalog.sections()
+                            if field in list_catalog[lid]
+                        ),
+                        "BUTTERFLY BACKUP CATALOG ({0})".format(field.upper()),
+                    )
                 )
-                for lid in list_catalog.sections():
-                    # Get session backup id
-                    bck_id = list_catalog[lid]
-                    if "cleaned" in bck_id:
-                        utility.write_log(
-                            log_args["status"],
-                            log_args["destination"],
-                            "INFO",
-                            "Backup id: {0}".format(lid),
-                        )
-                        utility.write_log(
-                            log_args["status"],
-                            log_args["destination"],
-                            "INFO",
-                            "Hostname or ip: {0}".format(bck_id.get("name", "")),
-                        )
-                        utility.write_log(
-                            log_args["status"],
-                            log_args["destination"],
-                            "INFO",
-                            "Timestamp: {0}".format(bck_id.get("timestamp", "")),
-                        )
-                        text += "Backup id: {0}".format(lid)
-                        text += "\n"
-                        text += "Hostname or ip: {0}".format(bck_id.get("name", ""))
-                        text += "\n"
-                        text += "Timestamp: {0}".format(bck_id.get("timestamp", ""))
-                        text += "\n\n"
-                utility.pager(text)
             else:
                 utility.print_verbose(
                     args.verbose, "List all backup in catalog", nocolor=args.color
                 )
-                text = "BUTTERFLY BACKUP CATALOG\n\n"
-                utility.write_log(
-                    log_args["status"],
-                    log_args["destination"],
-                    "INFO",
-                    "BUTTERFLY BACKUP CATALOG",
-                )
                 if args.hostname:
-                    for lid in list_catalog.sections():
-                        # Get session backup id
-                        bck_id = list_catalog[lid]
-                        if bck_id.get("name") == args.hostname:
-                            utility.write_log(
-                                log_args["status"],
-                                log_args["destination"],
-                                "INFO",
-                                "Backup id: {0}".format(lid),
-                            )
-                            utility.write_log(
-                                log_args["status"],
-                                log_args["destination"],
-                                "INFO",
-                                "Hostname or ip: {0}".format(bck_id.get("name", "")),
-                            )
-                            utility.write_log(
-                                log_args["status"],
-                                log_args["destination"],
-                                "INFO",
-                                "Timestamp: {0}".format(bck_id.get("timestamp", "")),
-                            )
-                            text += "Backup id: {0}".format(lid)
-                            text += "\n"
-                            text += "Hostname or ip: {0}".format(bck_id.get("name", ""))
-                            text += "\n"
-                            text += "Timestamp: {0}".format(bck_id.get("timestamp", ""))
-                            text += "\n\n"
-                else:
-                    for lid in list_catalog.sections():
-                        # Get session backup id
-                        bck_id = list_catalog[lid]
-                        utility.write_log(
-                            log_args["status"],
-                            log_args["destination"],
-                            "INFO",
-                            "Backup id: {0}".format(lid),
+                    # Backups of hostname from catalog index
+                    sections = (
+                        section.name
+                        for section in index_catalog(catalog_path).get(
+                            args.hostname, []
                         )
-                        utility.write_log(
-                            log_args["status"],
-                            log_args["destination"],
-                            "INFO",
-                            "Hostname or ip: {0}".format(bck_id.get("name", "")),
-                        )
-                        utility.write_log(
-                            log_args["status"],
-                            log_args["destination"],
-                            "INFO",
-                            "Timestamp: {0}".format(bck_id.get("timestamp", "")),
-                        )
-                        text += "Backup id: {0}".format(lid)
-                        text += "\n"
-                        text += "Hostname or ip: {0}".format(bck_id.get("name", ""))
-                        text += "\n"
-                        text += "Timestamp: {0}".format(bck_id.get("timestamp", ""))
-                        text += "\n\n"
-                utility.pager(text)
+                    )
+                else:
+                    sections = list_catalog.sections()
+                utility.pager_iter(
+                    catalog_lines(list_catalog, sections, "BUTTERFLY BACKUP CATALOG")
+                )
 
         # Check export session
         if args.action == "export":
             # Check rsync tool
-            rsync_path = args.rsync if args.rsync else None
-            check_rsync(rsync_path)
+            check_rsync(args.rsync)
             cmds = list()
             # Read catalog file
             catalog_path = os.path.join(args.catalog, catalog_file)
@@ -2597,7 +2745,7 @@ def main():
                 # Compose command
                 cmd = compose_command(args, None)
                 # Export
-                utility.write_log(
+                logger.log(
                     log_args["status"],
                     log_args["destination"],
                     "INFO",
@@ -2624,33 +2772,36 @@ def main():
                             )
                         )
                     )
-                    utility.write_log(
+                    logger.log(
                         log_args["status"],
                         log_args["destination"],
                         "INFO",
-                        "Export command {0}.".format(" ".join(cmd)),
+                        "Export command {0}.".format(shlex.join(cmd)),
                     )
                     # Check cut option
                     if args.cut:
-                        write_catalog(
-                            os.path.join(args.catalog, catalog_file),
-                            args.id,
-                            "cleaned",
-                            "True",
-                        )
+                        write_catalog(catalog_path, args.id, "cleaned", "True")
             # Start export
-            cmds.append(" ".join(cmd))
+            cmds.append(cmd)
+            # Write catalog file before export
+            flush_catalog(catalog_path)
+            logger.flush()
             run_in_parallel(start_process, cmds, 1)
-            if os.path.exists(os.path.join(args.destination, catalog_file)):
+            export_catalog_path = os.path.join(args.destination, catalog_file)
+            if os.path.exists(export_catalog_path):
                 # Migrate catalog to new file system
                 utility.find_replace(
-                    os.path.join(args.destination, catalog_file),
+                    export_catalog_path,
                     args.catalog.rstrip("/"),
                     args.destination.rstrip("/"),
                 )
 
     except Exception as err:
         utility.report_issue(err, False)
+    finally:
+        # Write pending catalog changes and logs
+        flush_catalog()
+        logger.close()
 
 
 if __name__ == "__main__":
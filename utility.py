@@ -21,6 +21,8 @@
 #     along with this program.  If not, see <http://www.gnu.org/licenses/>.
 #
 import os
+import queue
+import threading
 import traceback
 
 from fabric import Connection
@@ -113,8 +115,6 @@ def touch(filename, times=None):
     :param times: time creation of file
     :return:  file
     """
-    import os
-
     # Verify folder exists
     if not os.path.exists(filename):
         # touch file
@@ -137,41 +137,143 @@ def find_replace(filename, text_to_search, replacement_text):
             print(line.replace(text_to_search, replacement_text), end="")
 
 
-def write_log(status, log, level, message):
+class AsyncLogger:
     """
-    Write custom log in a custom path
-    :param status: if True, log to file
-    :param log: path of log file
-    :param level: level of log message
-    :param message: message of log
+    Write custom logs from a background thread,
+    with a single open of log file for every batch of messages
     """
-    # Check if status is True
-    if status:
+
+    def __init__(self, batch=256):
+        """
+        Start background thread
+        :param batch: max number of messages written for every batch
+        """
         import getpass
         import logging
 
-        # Create logging object
-        f_o_r_m_a_t = logging.Formatter(
+        self.batch = batch
+        self.name = getpass.getuser()
+        self.formatter = logging.Formatter(
             "%(asctime)s %(name)-4s %(levelname)-4s %(message)s"
         )
-        handler = logging.FileHandler(log)
-        handler.setFormatter(f_o_r_m_a_t)
-        logger = logging.getLogger(getpass.getuser())
-        logger.setLevel(logging.INFO)
-        logger.addHandler(handler)
-
-        # Check log level
-        if level == "INFO":
-            logger.info(message)
-        elif level == "WARNING":
-            logger.warning(message)
-        elif level == "ERROR":
-            logger.error(message)
-        elif level == "CRITICAL":
-            logger.critical(message)
-
-        # Remove handler
-        logger.removeHandler(handler)
+        # Lines of logs whose folder does not exist yet
+        self.pending = {}
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._drain, daemon=True)
+        self.thread.start()
+
+    def log(self, status, log, level, message):
+        """
+        Queue custom log in a custom path
+        :param status: if True, log to file
+        :param log: path of log file
+        :param level: level of log message
+        :param message: message of log
+        """
+        self.log_many(status, log, level, (message,))
+
+    def log_many(self, status, log, level, messages):
+        """
+        Queue many custom logs in a custom path, with a single queue item
+        :param status: if True, log to file
+        :param log: path of log file
+        :param level: level of log messages
+        :param messages: iterable of messages of log
+        """
+        import logging
+
+        # Check if status is True
+        if status and level in ("INFO", "WARNING", "ERROR", "CRITICAL"):
+            lines = []
+            for message in messages:
+                record = logging.makeLogRecord(
+                    {
+                        "name": self.name,
+                        "levelname": level,
+                        "levelno": logging.getLevelName(level),
+                        "msg": message,
+                    }
+                )
+                lines.append(self.formatter.format(record))
+            self.queue.put((log, "\n".join(lines)))
+
+    def flush(self):
+        """
+        Wait until all queued messages are written
+        """
+        # Empty item: write lines of logs whose folder has been created since
+        self.queue.put(())
+        self.queue.join()
+
+    def close(self):
+        """
+        Write all queued messages and stop background thread
+        """
+        self.queue.put(None)
+        self.thread.join()
+
+    def _drain(self):
+        """
+        Consume queued messages in batches
+        """
+        running = True
+        while running:
+            messages = [self.queue.get()]
+            while len(messages) < self.batch:
+                try:
+                    messages.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            for message in messages:
+                # Stop after this batch, whatever happens to other messages
+                if message is None:
+                    running = False
+                elif message:
+                    log, line = message
+                    self.pending.setdefault(log, []).append(line)
+            self._write_pending(last=not running)
+            for _ in messages:
+                self.queue.task_done()
+
+    def _write_pending(self, last=False):
+        """
+        Write lines of every log with a single open; folders are never created
+        here, so lines of a log wait until its folder exists
+        :param last: if True, write also logs whose folder does not exist
+        """
+        for log in list(self.pending):
+            if not last and not os.path.isdir(os.path.dirname(log) or "."):
+                continue
+            lines = self.pending.pop(log)
+            try:
+                with open(log, "a") as logfile:
+                    logfile.write("\n".join(lines) + "\n")
+            except (OSError, ValueError) as err:
+                # Report once; other log files are still written
+                error("Log write failed: {0}".format(err))
+
+
+def list_dir(directory):
+    """
+    Get names of folder entries, as a generator
+    :param directory: Path of folder
+    :return: generator of names
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            yield entry.name
+
+
+def list_folders(directory):
+    """
+    Get paths of sub-folders, as a generator
+    :param directory: Path of folder
+    :return: generator of paths
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                yield entry.path
 
 
 def make_dir(directory):
@@ -179,8 +281,6 @@ def make_dir(directory):
     Create a folder
     :param directory: Path of folder
     """
-    import os
-
     if not os.path.exists(directory):
         os.makedirs(directory)
 
@@ -272,7 +372,12 @@ def make_symlink(source, destination):
     """
 
     try:
-        if os.path.exists(destination):
+        if os.path.islink(destination):
+            # Link already points to source
+            if os.readlink(destination) == source:
+                return
+            os.unlink(destination)
+        elif os.path.exists(destination):
             os.unlink(destination)
         os.symlink(source, destination)
     except OSError:
@@ -387,7 +492,6 @@ def archive(path, date, days, destination):
     :param destination: destination of zip file
     :return: boolean
     """
-    import os
     import shutil
     from datetime import datetime, timedelta
     from time import mktime
@@ -425,12 +529,38 @@ def archive(path, date, days, destination):
             error("The path {0} is not exist.".format(path))
 
 
-def pager(text):
+def pager_iter(lines):
     """
-    Pagination function like less
-    :param text: text than would see with pagination
-    :return: docstring
+    Pagination function like less, streaming lines into pager
+    :param lines: iterable of lines than would see with pagination
     """
-    import pydoc
+    import shlex
+    import subprocess
+    import sys
 
-    pydoc.pager(text)
+    # Check if output is a terminal
+    if sys.stdout.isatty():
+        # Empty PAGER variable uses the default pager
+        command = shlex.split(os.environ.get("PAGER", "")) or ["less", "-R"]
+        try:
+            proc = subprocess.Popen(command, stdin=subprocess.PIPE, text=True)
+        except OSError:
+            proc = None
+    else:
+        proc = None
+    lines = iter(lines)
+    output = proc.stdin if proc else sys.stdout
+    try:
+        for line in lines:
+            output.write(line)
+        output.flush()
+    except BrokenPipeError:
+        # Output has been closed before the end of lines: consume the
+        # remaining lines anyway, so that their side effects (like logs) happen
+        for _ in lines:
+            pass
+        # Discard what is still buffered for the closed output
+        os.dup2(os.open(os.devnull, os.O_WRONLY), output.fileno())
+    if proc:
+        proc.stdin.close()
+        proc.wait()